@@ -0,0 +1,190 @@
+from __future__ import annotations
+import asyncio
+import socket
+from contextlib import AsyncExitStack
+from functools import lru_cache
+from typing import Any, Callable, ClassVar, Coroutine, TypeVar
+
+from metrics.metrics_factory import (
+    _CLOUDWATCH_CONFIG, _CRAWL_METRIC_TEMPLATE, get_dimensions, get_stat_name,
+    is_sampled
+)
+
+try:
+    import aioboto3
+except ImportError:
+    aioboto3 = None
+
+
+T = TypeVar('T')
+
+
+@lru_cache(maxsize=512)
+def _counter_datagram(collector_name: str) -> bytes:
+    return f'{get_stat_name(collector_name)}:1|c'.encode()
+
+
+async def _get_per_loop(cache: dict[asyncio.AbstractEventLoop,
+                                    asyncio.Future[T]],
+                        create: Callable[[], Coroutine[Any, Any, T]]) -> T:
+    """
+    Returns the resource of the running event loop, creating it once even
+    when first requested concurrently. Entries of closed loops are dropped
+    and a failed creation is not kept, so the next call tries again.
+    Cancelling a caller leaves the creation running for the others.
+
+    :param dict cache: Futures of the resource per event loop.
+    :param create: Coroutine function creating the resource.
+    :return: Resource of the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    future = cache.get(loop)
+    if future is None:
+        for closed_loop in [key for key in cache if key.is_closed()]:
+            del cache[closed_loop]
+        future = cache[loop] = loop.create_task(create())
+    try:
+        # Shielded, a cancelled caller must not cancel the shared creation.
+        return await asyncio.shield(future)
+    except BaseException:
+        if (future.done() and (future.cancelled() or future.exception())
+                and cache.get(loop) is future):
+            del cache[loop]
+        raise
+
+
+class AsyncAwsMetricClient:
+    """
+    This client is the asyncio implementation for aws client.
+
+    Every call to ``send_collector_metric`` is a single ``put_metric_data``
+    request, many of them can be in flight at the same time through
+    ``asyncio.gather``. One CloudWatch client is kept per event loop, it
+    must be released with ``close`` before the loop is closed.
+    """
+    namespace: ClassVar[str] = 'Collector-Metrics'
+
+    def __init__(self) -> None:
+        if aioboto3 is None:
+            raise ImportError(
+                'aioboto3 is required to use the AsyncAwsMetricClient.'
+            )
+        self._session = aioboto3.Session()
+        self._clients: dict[
+            asyncio.AbstractEventLoop,
+            asyncio.Future[tuple[Any, AsyncExitStack]]
+        ] = {}
+
+    async def client(self) -> Any:
+        """Returns CloudWatch client of the running event loop."""
+        client, _ = await _get_per_loop(self._clients, self._create_client)
+        return client
+
+    async def _create_client(self) -> tuple[Any, AsyncExitStack]:
+        stack = AsyncExitStack()
+        client = await stack.enter_async_context(
+            self._session.client('cloudwatch', config=_CLOUDWATCH_CONFIG)
+        )
+        return client, stack
+
+    async def send_collector_metric(self,
+                                    collector_name: str,
+                                    env_name: str = 'dev',
+                                    sample_rate: float = 1.0) -> None:
+        """
+        Sending of the counter metric via the aws client.
+
+        :param str collector_name: Name of collector to be used as value.
+        :param str env_name: Environment name.
+        :param float sample_rate: Fraction of the crawls to send, in (0, 1].
+        :return None
+        """
+        if not is_sampled(sample_rate):
+            return
+        client = await self.client()
+        await client.put_metric_data(
+            Namespace=self.namespace,
+            MetricData=[
+                {
+                    **_CRAWL_METRIC_TEMPLATE,
+                    'Dimensions': get_dimensions(collector_name, env_name),
+                    # A sampled crawl stands for 1 / sample_rate crawls.
+                    'Value': 1 / sample_rate
+                },
+            ]
+        )
+
+    async def close(self) -> None:
+        """
+        Closing of the CloudWatch client of the running event loop.
+
+        :return None
+        """
+        future = self._clients.pop(asyncio.get_running_loop(), None)
+        if future is not None:
+            _, stack = await future
+            await stack.aclose()
+
+
+class AsyncStatsDMetricClient:
+    """
+    This client is the asyncio implementation for statsd client.
+
+    One UDP datagram endpoint is kept per event loop, datagrams are written
+    to the transport without waiting for the socket. The endpoint must be
+    released with ``close`` before the loop is closed.
+    """
+
+    def __init__(self, host: str = 'localhost', port: int = 8125) -> None:
+        self.host = host
+        self.port = port
+        self._transports: dict[
+            asyncio.AbstractEventLoop,
+            asyncio.Future[asyncio.DatagramTransport]
+        ] = {}
+
+    async def transport(self) -> asyncio.DatagramTransport:
+        """Returns the UDP transport of the running event loop."""
+        return await _get_per_loop(self._transports, self._create_transport)
+
+    async def _create_transport(self) -> asyncio.DatagramTransport:
+        # IPv4 like StatsClient, localhost may resolve to ::1 first.
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol,
+            remote_addr=(self.host, self.port),
+            family=socket.AF_INET
+        )
+        return transport
+
+    async def send_collector_metric(self,
+                                    collector_name: str,
+                                    env_name: str = 'dev',
+                                    sample_rate: float = 1.0) -> None:
+        """
+        Sending of the counter metric via the statsd transport.
+
+        :param str collector_name: Name of collector to be used as label.
+        :param str env_name: Environment name.
+        :param float sample_rate: Fraction of the crawls to send, in (0, 1].
+        :return None
+        """
+        if not is_sampled(sample_rate):
+            return
+        transport = await self.transport()
+        if sample_rate < 1:
+            transport.sendto(
+                f'{get_stat_name(collector_name)}:1|c|@{sample_rate}'.encode()
+            )
+        else:
+            transport.sendto(_counter_datagram(collector_name))
+
+    async def close(self) -> None:
+        """
+        Closing of the UDP transport of the running event loop.
+
+        :return None
+        """
+        future = self._transports.pop(asyncio.get_running_loop(), None)
+        if future is not None:
+            (await future).close()
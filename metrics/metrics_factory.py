@@ -1,12 +1,330 @@
 from __future__ import annotations
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import random
+import socket
+import threading
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Any
+from collections import Counter
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, ClassVar, Mapping, Protocol
 
-import boto3
+import urllib3
+from boto3.session import Session
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
 from botocore.client import BaseClient
+from botocore.config import Config
 from statsd import StatsClient
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Collector name, environment name and sample rate of a queued crawl.
+_QueuedMetric = tuple[str, str, float]
+
+# PutMetricData bodies are gzipped once they reach this size, the botocore
+# default of 10KiB is never reached by a flush.
+_MIN_COMPRESSION_SIZE = 1024
+
+# Seconds to connect to and to wait for CloudWatch, a stalled request must
+# not block the worker thread forever.
+_CONNECT_TIMEOUT = 5.0
+_READ_TIMEOUT = 10.0
+
+
+def _botocore_config(**options: Any) -> Config:
+    """
+    Returns a botocore Config of the options the installed botocore
+    supports, request_min_compression_size_bytes needs botocore 1.31.14 and
+    older releases would raise TypeError on import.
+
+    :param options: Config options, unsupported ones are left out.
+    :return Config
+    """
+    return Config(**{
+        name: value for name, value in options.items()
+        if name in Config.OPTION_DEFAULTS
+    })
+
+
+_CLOUDWATCH_CONFIG = _botocore_config(
+    max_pool_connections=50,
+    retries={'max_attempts': 2, 'mode': 'standard'},
+    connect_timeout=_CONNECT_TIMEOUT,
+    read_timeout=_READ_TIMEOUT,
+    tcp_keepalive=True,
+    request_min_compression_size_bytes=_MIN_COMPRESSION_SIZE
+)
+
+
+def _http_pool() -> urllib3.PoolManager:
+    """
+    Returns a connection pool for the signed PutMetricData requests.
+
+    :return PoolManager
+    """
+    return urllib3.PoolManager(
+        num_pools=1,
+        maxsize=16,
+        timeout=urllib3.Timeout(connect=_CONNECT_TIMEOUT, read=_READ_TIMEOUT)
+    )
+
+
+_HTTP = _http_pool()
+
+# Fields shared by every crawl data point, so building one only adds the
+# dimensions and values to a copy of it. Data points carry no timestamp,
+# CloudWatch stamps them on receipt, at most a flush interval late.
+_CRAWL_METRIC_TEMPLATE: Mapping[str, Any] = MappingProxyType({
+    'MetricName': 'collector_crawl',
+    'Unit': 'Count'
+})
+
+_session: Session | None = None
+_session_lock = threading.Lock()
+
+_statsd_client: StatsClient | None = None
+_statsd_client_lock = threading.Lock()
+
+# Seconds the exit handler waits for queued metrics, so an unreachable
+# backend can not keep the process from exiting.
+_EXIT_FLUSH_TIMEOUT = 5.0
+
+# Increased in forked children, the workers compare it to reset themselves.
+_fork_generation = 0
+_fork_lock = threading.Lock()
+
+
+def get_session() -> Session:
+    """
+    Returns the boto3 session shared by every aws client, so configuration
+    files and credentials are resolved only once per process.
+
+    :return Session
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = Session()
+        return _session
+
+
+def get_statsd_client() -> StatsClient:
+    """
+    Returns the statsd client shared by every statsd client, so its UDP
+    socket is opened only once per process.
+
+    :return StatsClient
+    """
+    # The send buffer is set on StatsClient._sock and pipelines queue
+    # pre-sampled and tagged lines through Pipeline._after. Both are private
+    # to statsd, setup.py pins the range they were tested with.
+    global _statsd_client
+    with _statsd_client_lock:
+        if _statsd_client is None:
+            _statsd_client = StatsClient(
+                host='localhost',
+                port=8125,
+                maxudpsize=1432
+            )
+            # A larger send buffer absorbs crawl bursts instead of stalling
+            # the sender when the kernel queue is full.
+            _statsd_client._sock.setsockopt(
+                socket.SOL_SOCKET,
+                socket.SO_SNDBUF,
+                1 << 20
+            )
+        return _statsd_client
+
+
+@lru_cache(maxsize=512)
+def get_stat_name(collector_name: str) -> str:
+    """
+    Returns the statsd name of the crawl metric, cached since collectors
+    reuse a handful of names.
+
+    :param str collector_name: Name of collector that increase the metric.
+    :return str
+    """
+    return f'collector_crawl.{collector_name}'
+
+
+@lru_cache(maxsize=1024)
+def get_dimensions(collector_name: str,
+                   env_name: str) -> list[dict[str, str]]:
+    """
+    Returns the CloudWatch dimensions of the crawl metric. Collectors reuse
+    a handful of names, so the same list is shared by every data point of
+    a collector and must not be mutated.
+
+    :param str collector_name: Name of collector that increase the metric.
+    :param str env_name: Environment that is sending the metric.
+    :return list
+    """
+    return [
+        {
+            'Name': 'collector_name',
+            'Value': collector_name
+        },
+        {
+            'Name': 'environment',
+            'Value': env_name
+        },
+    ]
+
+
+def is_sampled(sample_rate: float) -> bool:
+    """
+    Returns whether a metric sent with the sample rate must be kept.
+
+    :param float sample_rate: Fraction of the metrics to keep, in (0, 1].
+    :return bool
+    """
+    if sample_rate >= 1:
+        if sample_rate > 1:
+            raise ValueError(f'Invalid sample rate: {sample_rate}')
+        return True
+    if sample_rate <= 0:
+        raise ValueError(f'Invalid sample rate: {sample_rate}')
+    return random.random() < sample_rate
+
+
+class MetricWorker:
+    """
+    The MetricWorker decouples the callers from the network I/O of the
+    clients. Metrics are put in a bounded queue and a daemon thread hands
+    them in batches to the handler, a batch is closed after ``batch_size``
+    metrics or ``flush_interval`` seconds, whichever happens first.
+    Metrics that do not fit in the queue are dropped and counted, sampled
+    out metrics are never queued.
+    """
+
+    def __init__(self,
+                 handler: Callable[[list[_QueuedMetric]], None],
+                 flush_interval: float = 0.0,
+                 batch_size: int = 1000,
+                 maxsize: int = 10_000) -> None:
+        """
+        :param handler: Callable that delivers a batch of metrics.
+        :param float flush_interval: Seconds to wait for a batch to fill up.
+        :param int batch_size: Maximum number of metrics per batch.
+        :param int maxsize: Maximum number of queued metrics.
+        """
+        self.handler = handler
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._maxsize = maxsize
+        self._exit_flush_registered = False
+        self._reset()
+
+    def _reset(self) -> None:
+        # Flush markers are events, they close the current batch and are
+        # set once it has been handled.
+        self._queue: queue.Queue[_QueuedMetric | threading.Event] = (
+            queue.Queue(self._maxsize)
+        )
+        self._worker_thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+        self._fork_generation = _fork_generation
+
+    def put(self,
+            collector_name: str,
+            env_name: str,
+            sample_rate: float = 1.0) -> None:
+        """
+        Sampling and queueing of the metric without waiting for its delivery.
+
+        :param str collector_name: Name of collector that increase the metric.
+        :param str env_name: Environment that is sending the metric.
+        :param float sample_rate: Fraction of the crawls to send, in (0, 1].
+        :return None
+        """
+        if not is_sampled(sample_rate):
+            return
+        self._start()
+        try:
+            self._queue.put_nowait((collector_name, env_name, sample_rate))
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float | None = None) -> None:
+        """
+        Waiting until every queued metric has been handled.
+
+        :param float timeout: Maximum seconds to wait, None waits forever.
+        :return None
+        """
+        thread = self._worker_thread
+        if (thread is None or not thread.is_alive()
+                or self._fork_generation != _fork_generation):
+            return
+        marker = threading.Event()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return
+        marker.wait(timeout)
+
+    def _start(self) -> None:
+        if (self._worker_thread is not None
+                and self._fork_generation == _fork_generation):
+            return
+        if self._fork_generation != _fork_generation:
+            with _fork_lock:
+                if self._fork_generation != _fork_generation:
+                    self._reset()
+        with self._thread_lock:
+            if self._worker_thread is None:
+                thread = threading.Thread(
+                    target=self._run,
+                    name='metric-worker',
+                    daemon=True
+                )
+                thread.start()
+                self._worker_thread = thread
+                if not self._exit_flush_registered:
+                    # Queued metrics must not be lost when the process
+                    # exits, forked children inherit the registration.
+                    atexit.register(self.flush, _EXIT_FLUSH_TIMEOUT)
+                    self._exit_flush_registered = True
+
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while (not isinstance(items[-1], threading.Event)
+                   and len(items) < self.batch_size):
+                timeout = deadline - time.monotonic()
+                try:
+                    if timeout > 0:
+                        items.append(self._queue.get(timeout=timeout))
+                    else:
+                        items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            batch = [item for item in items if isinstance(item, tuple)]
+            try:
+                if batch:
+                    self.handler(batch)
+            except Exception:
+                logger.exception('Failed to send %s metrics.', len(batch))
+            finally:
+                if isinstance(items[-1], threading.Event):
+                    items[-1].set()
+
 
 class MetricCreator(ABC):
     """
@@ -16,11 +334,12 @@ class MetricCreator(ABC):
     """
 
     @abstractmethod
-    def factory_client(self) -> Any: ...
+    def factory_client(self) -> MetricClient: ...
 
     def send_collector_crawl_metric(self,
                                     collector_name: str,
-                                    env_name: str = 'dev') -> None:
+                                    env_name: str = 'dev',
+                                    sample_rate: float = 1.0) -> None:
         """
         MetricCreator's primary responsibility is create a common interface to
         send metrics metrics through clients. Subclasses can indirectly change
@@ -29,6 +348,7 @@ class MetricCreator(ABC):
 
         :param str collector_name: Name of collector that increase the metric.
         :param str env_name: Name of environment that is sending the metric.
+        :param float sample_rate: Fraction of the crawls to send, in (0, 1].
         :return:
         """
         # Creating a client object.
@@ -36,7 +356,8 @@ class MetricCreator(ABC):
 
         metric_client.send_collector_metric(
             collector_name,
-            env_name
+            env_name,
+            sample_rate
         )
 
 
@@ -44,106 +365,391 @@ class AwsCreator(MetricCreator):
     """This creator implement a concrete class for aws."""
 
     def factory_client(self) -> AwsMetricClient:
-        return AwsMetricClient()
+        """Returns the process wide aws client."""
+        return _AWS_CLIENT
 
 
 class StatsDCreator(MetricCreator):
     """This creator implement concrete class for statsd."""
 
     def factory_client(self) -> StatsDMetricClient:
-        return StatsDMetricClient()
+        """Returns the process wide statsd client."""
+        return _STATSD_CLIENT
+
+
+class CloudWatchAgentCreator(MetricCreator):
+    """This creator implement concrete class for the cloudwatch agent."""
 
+    def factory_client(self) -> CloudWatchAgentClient:
+        """Returns the process wide cloudwatch agent client."""
+        return _CLOUDWATCH_AGENT_CLIENT
 
-class MetricClient(ABC):
+
+class MetricClient(Protocol):
     """
     The client interface declares the operations that all concrete clients
-    must implement.
+    must implement. Clients satisfy it structurally, they do not need to
+    inherit from it.
     """
     @property
-    @abstractmethod
     def client(self) -> Any: ...
 
-    @abstractmethod
     def send_collector_metric(self,
                               collector_name: str,
-                              env_name: str = 'dev') -> None:
+                              env_name: str = 'dev',
+                              sample_rate: float = 1.0) -> None:
         """
-        Abstract method to standardize metrics delivery across clients.
+        Method to standardize metrics delivery across clients.
 
         :param str collector_name: Name of collector that increase the metric.
         :param str env_name: Environment that is sending the metric.
+        :param float sample_rate: Fraction of the crawls to send, in (0, 1].
+        :return:
+        """
+        ...
+
+    def flush(self) -> None:
+        """
+        Method to wait for the delivery of every sent metric.
+
         :return:
         """
         ...
 
 
-# noinspection PyAttributeOutsideInit
-class AwsMetricClient(MetricClient):
-    """This client is the concrete implementation for aws client."""
+class AwsMetricClient:
+    """
+    This client is the concrete implementation for aws client.
+
+    Crawls are queued to a background worker, which counts them per
+    ``(collector_name, env_name)`` during ``flush_interval`` seconds and
+    delivers them as aggregated ``StatisticValues``, batching up to
+    ``max_batch_size`` dimension sets per ``put_metric_data`` call.
+    """
+    namespace: ClassVar[str] = 'Collector-Metrics'
+    max_batch_size: ClassVar[int] = 20
+    flush_interval: ClassVar[float] = 1.0
+
+    def __init__(self) -> None:
+        self.worker = MetricWorker(
+            self._send_batch,
+            flush_interval=self.flush_interval
+        )
+        self._client: BaseClient | None = None
 
     @property
     def client(self) -> BaseClient:
         """Returns CloudWatch client."""
-        try:
-            return self._client  # type: ignore
-        except AttributeError:
-            self._client = boto3.client('cloudwatch')
-            return self._client
+        # Cached by hand, mypyc compiles cached_property to a plain getter
+        # and the client must be dropped in forked children.
+        if self._client is None:
+            self._client = get_session().client(
+                'cloudwatch', config=_CLOUDWATCH_CONFIG
+            )
+        return self._client
 
     def send_collector_metric(self,
                               collector_name: str,
-                              env_name: str = 'dev') -> None:
+                              env_name: str = 'dev',
+                              sample_rate: float = 1.0) -> None:
         """
-        Sending of the counter metric via the statsd client.
+        Queueing of the counter metric to be sent via the aws client.
 
         :param str collector_name: Name of collector to be used as value.
         :param str env_name: Environment name.
+        :param float sample_rate: Fraction of the crawls to send, in (0, 1].
         :return None
         """
-        self.client.put_metric_data(
-            Namespace='Collector-Metrics',
-            MetricData=[
-                {
-                    'MetricName': 'collector_crawl',
-                    'Dimensions': [
-                        {
-                            'Name': 'collector_name',
-                            'Value': collector_name
-                        },
-                        {
-                            'Name': 'environment',
-                            'Value': env_name
-                        },
-                    ],
-                    'Timestamp': datetime.now(),
-                    'Value': 1,
-                    'Unit': 'Count'
-                },
-            ]
+        self.worker.put(collector_name, env_name, sample_rate)
+
+    def flush(self) -> None:
+        """
+        Waiting for the delivery of every queued metric.
+
+        :return None
+        """
+        self.worker.flush()
+
+    def _send_batch(self, batch: list[_QueuedMetric]) -> None:
+        # Every sampled crawl stands for 1 / sample_rate crawls.
+        counts: dict[tuple[str, str], float] = {}
+        for collector_name, env_name, sample_rate in batch:
+            key = (collector_name, env_name)
+            counts[key] = counts.get(key, 0) + 1 / sample_rate
+
+        metric_data = [
+            {
+                **_CRAWL_METRIC_TEMPLATE,
+                'Dimensions': get_dimensions(collector_name, env_name),
+                'StatisticValues': {
+                    'SampleCount': count,
+                    'Sum': count,
+                    'Minimum': 1,
+                    'Maximum': 1
+                }
+            }
+            for (collector_name, env_name), count in counts.items()
+        ]
+
+        # Looking the cached property up once, it is slower than a plain
+        # attribute on every access.
+        client = self.client
+        for start in range(0, len(metric_data), self.max_batch_size):
+            chunk = metric_data[start:start + self.max_batch_size]
+            if not self._post_metric_data(client, chunk):
+                # The full client retries and raises a meaningful error.
+                client.put_metric_data(
+                    Namespace=self.namespace,
+                    MetricData=chunk
+                )
+
+    def _post_metric_data(self,
+                          client: BaseClient,
+                          metric_data: list[dict[str, Any]]) -> bool:
+        """
+        Sending of the data points as a SigV4 signed PutMetricData request
+        in the JSON protocol, skipping the botocore validation, event hooks
+        and response parsing of the client.
+
+        :param BaseClient client: CloudWatch client to take endpoint from.
+        :param list metric_data: Data points of a single request.
+        :return bool: Whether CloudWatch accepted the data points.
+        """
+        credentials = get_session().get_credentials()
+        if credentials is None:
+            return False
+
+        body = _dumps(
+            {'Namespace': self.namespace, 'MetricData': metric_data}
         )
+        headers = {
+            'Content-Type': 'application/x-amz-json-1.0',
+            'X-Amz-Target': 'GraniteServiceVersion20100801.PutMetricData'
+        }
+        if len(body) >= _MIN_COMPRESSION_SIZE:
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
 
+        request = AWSRequest(
+            method='POST',
+            url=client.meta.endpoint_url,
+            data=body,
+            headers=headers
+        )
+        SigV4Auth(
+            credentials.get_frozen_credentials(),
+            'monitoring',
+            client.meta.region_name
+        ).add_auth(request)
 
-# noinspection PyAttributeOutsideInit
-class StatsDMetricClient(MetricClient):
-    """This client is the concrete implementation for statsd client."""
+        try:
+            response = _HTTP.urlopen(
+                'POST',
+                request.url,
+                body=body,
+                headers=dict(request.headers.items()),
+                retries=False
+            )
+        except urllib3.exceptions.HTTPError:
+            logger.warning('Signed PutMetricData request failed.',
+                           exc_info=True)
+            return False
+        return response.status == 200
 
-    @property
+
+def _dumps(value: Any) -> bytes:
+    # orjson is optional, it is several times faster than the json module.
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(',', ':')).encode()
+
+
+class StatsDMetricClient:
+    """
+    This client is the concrete implementation for statsd client.
+
+    Crawls are queued to a background worker, which sends whatever is
+    pending through a statsd pipeline, packing many increments per
+    datagram.
+    """
+
+    def __init__(self) -> None:
+        self.worker = MetricWorker(self._send_batch)
+
+    @cached_property
     def client(self) -> StatsClient:
         """Returns statsD client."""
-        try:
-            return self._client
-        except AttributeError:
-            self._client = StatsClient()
-            return self._client
+        return get_statsd_client()
 
     def send_collector_metric(self,
                               collector_name: str,
-                              env_name: str = 'dev') -> None:
+                              env_name: str = 'dev',
+                              sample_rate: float = 1.0) -> None:
         """
-        Sending of the counter metric via the statsd client.
+        Queueing of the counter metric to be sent via the statsd client.
 
         :param str collector_name: Name of collector to be used as label.
         :param str env_name: Environment name.
+        :param float sample_rate: Fraction of the crawls to send, in (0, 1].
+        :return None
+        """
+        self.worker.put(collector_name, env_name, sample_rate)
+
+    def flush(self) -> None:
+        """
+        Waiting for the delivery of every queued metric.
+
+        :return None
+        """
+        self.worker.flush()
+
+    def send_collector_metric_batch(self,
+                                    collector_names: list[str],
+                                    env_name: str = 'dev',
+                                    sample_rate: float = 1.0) -> None:
+        """
+        Sending of the counter metrics right away via the statsd client,
+        packing as many increments per datagram as they fit.
+
+        :param list collector_names: Names of collectors to be used as label.
+        :param str env_name: Environment name.
+        :param float sample_rate: Fraction of the crawls to send, in (0, 1].
+        :return None
+        """
+        self._send_batch([
+            (name, env_name, sample_rate)
+            for name in collector_names
+            if is_sampled(sample_rate)
+        ])
+
+    def _send_batch(self, batch: list[_QueuedMetric]) -> None:
+        with self.client.pipeline() as pipe:
+            for collector_name, _, sample_rate in batch:
+                if sample_rate < 1:
+                    # Already sampled, the pipeline would sample it again.
+                    pipe._after(
+                        f'{get_stat_name(collector_name)}:1|c|@{sample_rate}'
+                    )
+                else:
+                    pipe.incr(get_stat_name(collector_name))
+
+
+@lru_cache(maxsize=1024)
+def get_agent_tags(collector_name: str, env_name: str) -> str:
+    """
+    Returns the statsd tags the cloudwatch agent turns into the dimensions
+    of the crawl metric.
+
+    :param str collector_name: Name of collector that increase the metric.
+    :param str env_name: Environment that is sending the metric.
+    :return str
+    """
+    return f'|#collector_name:{collector_name},environment:{env_name}'
+
+
+class CloudWatchAgentClient:
+    """
+    This client is the concrete implementation for a local cloudwatch agent,
+    which batches, retries and signs the requests to CloudWatch.
+
+    Crawls are queued to a background worker, which counts them per
+    ``(collector_name, env_name)`` and sends them to the statsd listener of
+    the agent, with the dimensions as tags. Use AwsMetricClient where no
+    agent runs next to the process.
+    """
+
+    def __init__(self) -> None:
+        self.worker = MetricWorker(self._send_batch)
+
+    @cached_property
+    def client(self) -> StatsClient:
+        """Returns statsD client of the agent listener."""
+        return get_statsd_client()
+
+    def send_collector_metric(self,
+                              collector_name: str,
+                              env_name: str = 'dev',
+                              sample_rate: float = 1.0) -> None:
+        """
+        Queueing of the counter metric to be sent via the cloudwatch agent.
+
+        :param str collector_name: Name of collector to be used as dimension.
+        :param str env_name: Environment name.
+        :param float sample_rate: Fraction of the crawls to send, in (0, 1].
         :return None
         """
-        self.client.incr(f'collector_crawl.{collector_name}')
+        self.worker.put(collector_name, env_name, sample_rate)
+
+    def flush(self) -> None:
+        """
+        Waiting for the delivery of every queued metric.
+
+        :return None
+        """
+        self.worker.flush()
+
+    def _send_batch(self, batch: list[_QueuedMetric]) -> None:
+        with self.client.pipeline() as pipe:
+            for metric, count in Counter(batch).items():
+                collector_name, env_name, sample_rate = metric
+                rate = f'|@{sample_rate}' if sample_rate < 1 else ''
+                # StatsClient has no tags support, the tagged line is
+                # queued through the same hook its own methods use.
+                pipe._after(
+                    f'collector_crawl:{count}|c{rate}'
+                    f'{get_agent_tags(collector_name, env_name)}'
+                )
+
+
+# Clients are cheap to build, their connections are only opened on use.
+_AWS_CLIENT = AwsMetricClient()
+_STATSD_CLIENT = StatsDMetricClient()
+_CLOUDWATCH_AGENT_CLIENT = CloudWatchAgentClient()
+
+_BACKENDS: dict[str, Callable[[str, str, float], None]] = {
+    'aws': _AWS_CLIENT.send_collector_metric,
+    'statsd': _STATSD_CLIENT.send_collector_metric,
+    'cloudwatch_agent': _CLOUDWATCH_AGENT_CLIENT.send_collector_metric,
+}
+
+
+def _reset_after_fork() -> None:
+    # Worker threads do not survive a fork, the child workers reset their
+    # queue and lock on the next metric. Metrics queued before the fork are
+    # sent by the parent. Compiled workers cannot be weakly referenced, so
+    # they are not tracked here.
+    global _fork_generation, _fork_lock, _HTTP, _session, _session_lock
+    _fork_generation += 1
+    _fork_lock = threading.Lock()
+    # Keep-alive TLS connections of the parent must not be written to by
+    # the child, it opens its own pool, session and CloudWatch client.
+    _HTTP = _http_pool()
+    _session = None
+    _session_lock = threading.Lock()
+    _AWS_CLIENT._client = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def send_collector_crawl_metric(backend: str,
+                                collector_name: str,
+                                env_name: str = 'dev',
+                                sample_rate: float = 1.0) -> None:
+    """
+    Sending of the crawl metric through the process wide client of the
+    backend, without going through a creator.
+
+    :param str backend: Name of the backend, ``aws``, ``statsd`` or
+        ``cloudwatch_agent``.
+    :param str collector_name: Name of collector that increase the metric.
+    :param str env_name: Name of environment that is sending the metric.
+    :param float sample_rate: Fraction of the crawls to send, in (0, 1].
+    :return None
+    """
+    try:
+        send = _BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f'Unknown metric backend: {backend}') from None
+    send(collector_name, env_name, sample_rate)
@@ -0,0 +1,29 @@
+import os
+
+from setuptools import find_packages, setup
+
+ext_modules = []
+# Opt-in, compiles the hot dispatch path to a C extension. The pure Python
+# module is used whenever the extension is not built.
+if os.environ.get('METRICS_USE_MYPYC') == '1':
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify([
+        '--ignore-missing-imports',
+        'metrics/metrics_factory.py',
+    ])
+
+setup(
+    name='metrics',
+    version='0.1.0',
+    description='Factory pattern to send metrics using statsD and aws '
+                'cloudwatch.',
+    packages=find_packages(exclude=['tests']),
+    python_requires='>=3.9',
+    install_requires=['boto3', 'botocore', 'statsd>=3.3,<5', 'urllib3'],
+    extras_require={
+        'async': ['aioboto3'],
+        'orjson': ['orjson'],
+    },
+    ext_modules=ext_modules,
+)
@@ -0,0 +1,148 @@
+import asyncio
+import gc
+import socket
+import unittest
+import warnings
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from metrics.async_metrics_factory import (
+    AsyncAwsMetricClient, AsyncStatsDMetricClient
+)
+
+
+class TestAsyncMetricsFactory(unittest.IsolatedAsyncioTestCase):
+    """Test AsyncMetricsFactory"""
+
+    @patch('metrics.async_metrics_factory.aioboto3')
+    async def test_aws_client_send_concurrent_messages(
+            self,
+            aioboto3_mock: MagicMock) -> None:
+        client_mock = AsyncMock()
+        session_mock = aioboto3_mock.Session.return_value
+        session_mock.client.return_value.__aenter__.return_value = client_mock
+
+        metric_client = AsyncAwsMetricClient()
+        await asyncio.gather(*(
+            metric_client.send_collector_metric(collector_name='gitlab_crawl')
+            for _ in range(3)
+        ))
+        await metric_client.close()
+
+        session_mock.client.assert_called_once()
+        self.assertEqual(client_mock.put_metric_data.await_count, 3)
+        session_mock.client.return_value.__aexit__.assert_awaited_once()
+
+    @patch('metrics.async_metrics_factory.aioboto3', None)
+    def test_aws_client_requires_aioboto3(self) -> None:
+        with self.assertRaises(ImportError):
+            AsyncAwsMetricClient()
+
+    async def test_statsd_client_send_correct_message(self) -> None:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as server:
+            server.bind(('127.0.0.1', 0))
+            server.settimeout(1)
+
+            metric_client = AsyncStatsDMetricClient(
+                host='127.0.0.1',
+                port=server.getsockname()[1]
+            )
+            await metric_client.send_collector_metric(
+                collector_name='gitlab_crawl'
+            )
+            await metric_client.close()
+
+            self.assertEqual(
+                server.recv(1024),
+                b'collector_crawl.gitlab_crawl:1|c'
+            )
+
+    @patch('metrics.metrics_factory.random.random', return_value=0.05)
+    async def test_statsd_client_send_sample_rate(
+            self,
+            _random_mock: MagicMock) -> None:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as server:
+            server.bind(('127.0.0.1', 0))
+            server.settimeout(1)
+
+            metric_client = AsyncStatsDMetricClient(
+                host='127.0.0.1',
+                port=server.getsockname()[1]
+            )
+            await metric_client.send_collector_metric(
+                collector_name='gitlab_crawl',
+                sample_rate=0.1
+            )
+            await metric_client.close()
+
+            self.assertEqual(
+                server.recv(1024),
+                b'collector_crawl.gitlab_crawl:1|c|@0.1'
+            )
+
+    async def test_statsd_client_retry_after_failed_transport(self) -> None:
+        transport_mock = MagicMock()
+        metric_client = AsyncStatsDMetricClient()
+        with patch.object(metric_client, '_create_transport',
+                          AsyncMock(side_effect=[OSError, transport_mock])):
+            with self.assertRaises(OSError):
+                await metric_client.send_collector_metric(
+                    collector_name='gitlab_crawl'
+                )
+            await metric_client.send_collector_metric(
+                collector_name='gitlab_crawl'
+            )
+
+        transport_mock.sendto.assert_called_once_with(
+            b'collector_crawl.gitlab_crawl:1|c'
+        )
+
+    async def test_statsd_client_cancelled_caller_keeps_transport(
+            self) -> None:
+        created = asyncio.Event()
+        transport_mock = MagicMock()
+
+        async def create_transport() -> MagicMock:
+            await created.wait()
+            return transport_mock
+
+        metric_client = AsyncStatsDMetricClient()
+        with patch.object(metric_client, '_create_transport',
+                          create_transport):
+            first = asyncio.ensure_future(metric_client.transport())
+            second = asyncio.ensure_future(metric_client.transport())
+            await asyncio.sleep(0)
+            first.cancel()
+            created.set()
+
+            with self.assertRaises(asyncio.CancelledError):
+                await first
+            self.assertIs(await second, transport_mock)
+            self.assertIs(await metric_client.transport(), transport_mock)
+
+
+class TestAsyncMetricsFactoryLoops(unittest.TestCase):
+    """Test AsyncMetricsFactory across event loops"""
+
+    def test_statsd_client_releases_closed_loops(self) -> None:
+        metric_client = AsyncStatsDMetricClient(host='127.0.0.1')
+        # Transports left open on purpose, the cache must still be bounded.
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', ResourceWarning)
+            for _ in range(5):
+                asyncio.run(metric_client.send_collector_metric(
+                    collector_name='gitlab_crawl'
+                ))
+            self.assertEqual(len(metric_client._transports), 1)
+            metric_client._transports.clear()
+            gc.collect()
+
+        for _ in range(5):
+            asyncio.run(self._send_and_close(metric_client))
+        self.assertEqual(len(metric_client._transports), 0)
+
+    @staticmethod
+    async def _send_and_close(metric_client: AsyncStatsDMetricClient) -> None:
+        await metric_client.send_collector_metric(
+            collector_name='gitlab_crawl'
+        )
+        await metric_client.close()
@@ -1,12 +1,30 @@
+import json
 import os
+import threading
+import time
 import unittest
-from datetime import datetime
 from unittest.mock import MagicMock, patch
 
+import urllib3
+from botocore.config import Config
+from botocore.credentials import Credentials
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from metrics import metrics_factory
 from metrics.metrics_factory import (
-    AwsCreator, StatsDCreator, AwsMetricClient, StatsDMetricClient
+    _botocore_config, _dumps, AwsCreator, StatsDCreator,
+    CloudWatchAgentCreator, MetricCreator, AwsMetricClient,
+    StatsDMetricClient, CloudWatchAgentClient, MetricWorker,
+    get_dimensions, get_session, get_stat_name, get_statsd_client,
+    is_sampled, send_collector_crawl_metric
 )
 
+_ENDPOINT_URL = 'https://monitoring.us-east-1.amazonaws.com'
+
 
 class TestMetricsFactory(unittest.TestCase):
     """Test MetricsFactory"""
@@ -14,6 +32,27 @@ class TestMetricsFactory(unittest.TestCase):
     def setUp(self) -> None:
         self._metric_client = None
 
+    def _patch_signed_request(self) -> tuple[MagicMock, MagicMock]:
+        """
+        Patching of the CloudWatch client, the session credentials and the
+        connection pool used by the signed PutMetricData requests.
+
+        :return: Mocks of the CloudWatch client and of the connection pool.
+        """
+        mocks = []
+        for target in ('AwsMetricClient.client', 'get_session', '_HTTP'):
+            patcher = patch(f'metrics.metrics_factory.{target}')
+            mocks.append(patcher.start())
+            self.addCleanup(patcher.stop)
+        client_mock, session_mock, http_mock = mocks
+
+        client_mock.meta.endpoint_url = _ENDPOINT_URL
+        client_mock.meta.region_name = 'us-east-1'
+        session_mock.return_value.get_credentials.return_value = Credentials(
+            'access_key', 'secret_key'
+        )
+        return client_mock, http_mock
+
     def test_aws_client_get_client_success(self):
         metric_creator = AwsCreator()
 
@@ -30,21 +69,85 @@ class TestMetricsFactory(unittest.TestCase):
             StatsDMetricClient
         )
 
+    def test_cloudwatch_agent_client_get_client_success(self):
+        metric_creator = CloudWatchAgentCreator()
+
+        self.assertIsInstance(
+            metric_creator.factory_client(),
+            CloudWatchAgentClient
+        )
+
+    def test_metric_creator_requires_factory_client(self):
+        with self.assertRaises(TypeError):
+            MetricCreator()
+
+    def test_aws_client_is_reused_across_creators(self):
+        self.assertIs(
+            AwsCreator().factory_client(),
+            AwsCreator().factory_client()
+        )
+
+    def test_statsd_client_is_reused_across_creators(self):
+        self.assertIs(
+            StatsDCreator().factory_client(),
+            StatsDCreator().factory_client()
+        )
+
+    def test_send_collector_crawl_metric_dispatch_to_backend(self):
+        send_mock = MagicMock()
+
+        with patch.dict('metrics.metrics_factory._BACKENDS',
+                        {'statsd': send_mock}):
+            send_collector_crawl_metric('statsd', 'gitlab_crawl', 'prod')
+
+        send_mock.assert_called_once_with('gitlab_crawl', 'prod', 1.0)
+
+    def test_send_collector_crawl_metric_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            send_collector_crawl_metric('unknown', 'gitlab_crawl')
+
+    def test_aws_dimensions_are_reused(self):
+        self.assertIs(
+            get_dimensions('gitlab_crawl', 'dev'),
+            get_dimensions('gitlab_crawl', 'dev')
+        )
+        self.assertIsNot(
+            get_dimensions('gitlab_crawl', 'dev'),
+            get_dimensions('gitlab_crawl', 'prod')
+        )
+
+    def test_aws_session_is_shared(self):
+        self.assertIs(get_session(), get_session())
+
+    @patch('metrics.metrics_factory.get_session')
+    def test_aws_client_built_from_shared_session(
+            self,
+            session_mock: MagicMock) -> None:
+        metric_client = AwsMetricClient()
+        client = metric_client.client
+
+        self.assertIs(metric_client.client, client)
+        session_mock.return_value.client.assert_called_once()
+        self.assertIs(client, session_mock.return_value.client.return_value)
+
     @patch.dict(os.environ, {'AWS_DEFAULT_REGION': 'us-east-1'})
-    @patch('metrics.metrics_factory.datetime')
+    @patch.object(AwsMetricClient, '_post_metric_data',
+                  MagicMock(return_value=False))
+    @patch.object(AwsMetricClient, 'flush_interval', 60.0)
     @patch('metrics.metrics_factory.AwsMetricClient.client')
     def test_aws_client_send_correct_message(self,
-                                             client_mock: MagicMock,
-                                             datetime_mock: MagicMock) -> None:
+                                             client_mock: MagicMock) -> None:
         self._metric_client = AwsMetricClient()
 
-        # Mocking now, never will be the same.
-        current_moment = datetime(2022, 3, 15, 18, 28, 42, 809605)
-        datetime_mock.now.return_value = current_moment
-
         self._metric_client.send_collector_metric(
             collector_name='gitlab_crawl'
         )
+        self._metric_client.send_collector_metric(
+            collector_name='gitlab_crawl'
+        )
+        client_mock.put_metric_data.assert_not_called()
+
+        self._metric_client.flush()
 
         client_mock.put_metric_data.assert_called_once_with(
             Namespace='Collector-Metrics',
@@ -61,13 +164,159 @@ class TestMetricsFactory(unittest.TestCase):
                             'Value': 'dev'
                         },
                     ],
-                    'Timestamp': current_moment,
-                    'Value': 1,
+                    'StatisticValues': {
+                        'SampleCount': 2,
+                        'Sum': 2,
+                        'Minimum': 1,
+                        'Maximum': 1
+                    },
                     'Unit': 'Count'
                 },
             ]
         )
 
+    @patch.dict(os.environ, {'AWS_DEFAULT_REGION': 'us-east-1'})
+    @patch.object(AwsMetricClient, '_post_metric_data',
+                  MagicMock(return_value=False))
+    @patch.object(AwsMetricClient, 'flush_interval', 60.0)
+    @patch('metrics.metrics_factory.AwsMetricClient.client')
+    def test_aws_client_split_metric_data_in_batches(
+            self,
+            client_mock: MagicMock) -> None:
+        self._metric_client = AwsMetricClient()
+
+        for index in range(AwsMetricClient.max_batch_size + 5):
+            self._metric_client.send_collector_metric(
+                collector_name=f'collector_{index}'
+            )
+        self._metric_client.flush()
+
+        self.assertEqual(client_mock.put_metric_data.call_count, 2)
+        first_call, second_call = client_mock.put_metric_data.call_args_list
+        self.assertEqual(
+            len(first_call.kwargs['MetricData']),
+            AwsMetricClient.max_batch_size
+        )
+        self.assertEqual(len(second_call.kwargs['MetricData']), 5)
+
+    def test_aws_client_post_signed_metric_data(self):
+        client_mock, http_mock = self._patch_signed_request()
+        http_mock.urlopen.return_value.status = 200
+        self._metric_client = AwsMetricClient()
+
+        self._metric_client.send_collector_metric(
+            collector_name='gitlab_crawl'
+        )
+        self._metric_client.flush()
+
+        client_mock.put_metric_data.assert_not_called()
+        http_mock.urlopen.assert_called_once()
+        args, kwargs = http_mock.urlopen.call_args
+        self.assertEqual(args, ('POST', _ENDPOINT_URL))
+        self.assertEqual(
+            kwargs['headers']['X-Amz-Target'],
+            'GraniteServiceVersion20100801.PutMetricData'
+        )
+        self.assertTrue(
+            kwargs['headers']['Authorization'].startswith(
+                'AWS4-HMAC-SHA256 Credential=access_key/'
+            )
+        )
+        payload = json.loads(kwargs['body'])
+        self.assertEqual(payload['Namespace'], 'Collector-Metrics')
+        self.assertEqual(
+            payload['MetricData'][0]['StatisticValues']['SampleCount'],
+            1
+        )
+
+    def test_aws_client_fallback_when_signed_request_fails(self):
+        client_mock, http_mock = self._patch_signed_request()
+        http_mock.urlopen.return_value.status = 400
+        self._metric_client = AwsMetricClient()
+
+        self._metric_client.send_collector_metric(
+            collector_name='gitlab_crawl'
+        )
+        self._metric_client.flush()
+
+        http_mock.urlopen.assert_called_once()
+        client_mock.put_metric_data.assert_called_once()
+
+    def test_aws_client_fallback_when_signed_request_times_out(self):
+        client_mock, http_mock = self._patch_signed_request()
+        http_mock.urlopen.side_effect = urllib3.exceptions.ReadTimeoutError(
+            None, _ENDPOINT_URL, 'timed out'
+        )
+        self._metric_client = AwsMetricClient()
+
+        self._metric_client.send_collector_metric(
+            collector_name='gitlab_crawl'
+        )
+        self._metric_client.flush()
+
+        http_mock.urlopen.assert_called_once()
+        client_mock.put_metric_data.assert_called_once()
+
+    def test_botocore_config_skips_unsupported_options(self):
+        option_defaults = {
+            name: value for name, value in Config.OPTION_DEFAULTS.items()
+            if name != 'request_min_compression_size_bytes'
+        }
+
+        with patch.object(Config, 'OPTION_DEFAULTS', option_defaults):
+            config = _botocore_config(
+                read_timeout=10.0,
+                request_min_compression_size_bytes=1024
+            )
+
+        self.assertEqual(config.read_timeout, 10.0)
+        self.assertIsNone(
+            getattr(config, 'request_min_compression_size_bytes', None)
+        )
+
+    def test_aws_signed_requests_have_timeouts(self):
+        timeout = metrics_factory._HTTP.connection_pool_kw['timeout']
+
+        self.assertEqual(timeout.connect_timeout, 5.0)
+        self.assertEqual(timeout.read_timeout, 10.0)
+
+    def test_aws_payload_serialized_without_orjson(self):
+        payload = {'Namespace': 'Collector-Metrics', 'MetricData': []}
+
+        with patch('metrics.metrics_factory.orjson', None):
+            body = _dumps(payload)
+
+        self.assertEqual(
+            body,
+            b'{"Namespace":"Collector-Metrics","MetricData":[]}'
+        )
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_aws_payload_serialized_with_orjson(self):
+        payload = {'Namespace': 'Collector-Metrics', 'MetricData': []}
+
+        self.assertEqual(
+            _dumps(payload),
+            b'{"Namespace":"Collector-Metrics","MetricData":[]}'
+        )
+
+    def test_statsd_client_is_shared(self):
+        self.assertIs(
+            StatsDMetricClient().client,
+            StatsDMetricClient().client
+        )
+        self.assertIs(StatsDMetricClient().client, get_statsd_client())
+
+    def test_statsd_stat_name_is_reused(self):
+        self.assertEqual(
+            get_stat_name('gitlab_crawl'),
+            'collector_crawl.gitlab_crawl'
+        )
+        self.assertIs(
+            get_stat_name('gitlab_crawl'),
+            get_stat_name('gitlab_crawl')
+        )
+
     @patch('metrics.metrics_factory.StatsDMetricClient.client')
     def test_statsd_instance_client_correct(self,
                                             client_mock: MagicMock) -> None:
@@ -76,8 +325,154 @@ class TestMetricsFactory(unittest.TestCase):
         self._metric_client.send_collector_metric(
             collector_name='gitlab_crawl'
         )
+        self._metric_client.flush()
 
         parameter = 'collector_crawl.gitlab_crawl'
 
-        client_mock.incr.assert_called_once_with(parameter)
+        pipe_mock = client_mock.pipeline.return_value.__enter__.return_value
+        pipe_mock.incr.assert_called_once_with(parameter)
+
+    @patch('metrics.metrics_factory.StatsDMetricClient.client')
+    def test_statsd_send_batch_through_pipeline(
+            self,
+            client_mock: MagicMock) -> None:
+        self._metric_client = StatsDMetricClient()
+
+        self._metric_client.send_collector_metric_batch(
+            ['gitlab_crawl', 'github_crawl']
+        )
+
+        client_mock.pipeline.assert_called_once()
+        pipe_mock = client_mock.pipeline.return_value.__enter__.return_value
+        self.assertEqual(
+            [call.args for call in pipe_mock.incr.call_args_list],
+            [('collector_crawl.gitlab_crawl',),
+             ('collector_crawl.github_crawl',)]
+        )
+
+    @patch('metrics.metrics_factory.CloudWatchAgentClient.client')
+    def test_cloudwatch_agent_client_send_tagged_counter(
+            self,
+            client_mock: MagicMock) -> None:
+        self._metric_client = CloudWatchAgentClient()
+
+        self._metric_client.send_collector_metric(
+            collector_name='gitlab_crawl'
+        )
+        self._metric_client.flush()
+
+        pipe_mock = client_mock.pipeline.return_value.__enter__.return_value
+        pipe_mock._after.assert_called_once_with(
+            'collector_crawl:1|c|#collector_name:gitlab_crawl,environment:dev'
+        )
+
+    @patch.dict(os.environ, {'AWS_DEFAULT_REGION': 'us-east-1'})
+    @patch.object(AwsMetricClient, '_post_metric_data',
+                  MagicMock(return_value=False))
+    @patch('metrics.metrics_factory.random.random', return_value=0.05)
+    @patch('metrics.metrics_factory.AwsMetricClient.client')
+    def test_aws_client_scale_sampled_metrics(
+            self,
+            client_mock: MagicMock,
+            _random_mock: MagicMock) -> None:
+        self._metric_client = AwsMetricClient()
+
+        self._metric_client.send_collector_metric(
+            collector_name='gitlab_crawl',
+            sample_rate=0.1
+        )
+        self._metric_client.flush()
+
+        metric_data = client_mock.put_metric_data.call_args.kwargs[
+            'MetricData'
+        ]
+        self.assertAlmostEqual(
+            metric_data[0]['StatisticValues']['SampleCount'],
+            10
+        )
+
+    @patch('metrics.metrics_factory.random.random', return_value=0.5)
+    @patch('metrics.metrics_factory.StatsDMetricClient.client')
+    def test_statsd_client_send_sample_rate(
+            self,
+            client_mock: MagicMock,
+            _random_mock: MagicMock) -> None:
+        self._metric_client = StatsDMetricClient()
+
+        self._metric_client.send_collector_metric(
+            collector_name='gitlab_crawl',
+            sample_rate=0.1
+        )
+        self._metric_client.send_collector_metric(
+            collector_name='gitlab_crawl',
+            sample_rate=0.75
+        )
+        self._metric_client.flush()
+
+        pipe_mock = client_mock.pipeline.return_value.__enter__.return_value
+        pipe_mock._after.assert_called_once_with(
+            'collector_crawl.gitlab_crawl:1|c|@0.75'
+        )
+        pipe_mock.incr.assert_not_called()
+
+    def test_sample_rate_out_of_range(self):
+        for sample_rate in (0, -1, 1.5):
+            with self.assertRaises(ValueError):
+                is_sampled(sample_rate)
+
+    def test_worker_flush_wait_is_bounded(self):
+        release = threading.Event()
+        worker = MetricWorker(lambda batch: release.wait())
+
+        worker.put('gitlab_crawl', 'dev')
+        started = time.monotonic()
+        worker.flush(timeout=0.1)
+
+        self.assertLess(time.monotonic() - started, 1)
+        release.set()
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'os.fork is not available')
+    def test_worker_send_metrics_after_fork(self):
+        read_fd, write_fd = os.pipe()
+        worker = MetricWorker(
+            lambda batch: os.write(write_fd, batch[0][0].encode())
+        )
+        worker.put('parent', 'dev')
+        worker.flush()
+        self.assertEqual(os.read(read_fd, 64), b'parent')
+        http = metrics_factory._HTTP
+        aws_client = metrics_factory._AWS_CLIENT
+        get_session()
+
+        with patch.object(aws_client, '_client', MagicMock()):
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    worker.put('child', 'dev')
+                    worker.flush(timeout=5)
+                    reset = (
+                        metrics_factory._HTTP is not http
+                        and metrics_factory._session is None
+                        and aws_client._client is None
+                    )
+                    os.write(write_fd, b' reset' if reset else b' shared')
+                finally:
+                    os._exit(0)
+
+        os.waitpid(pid, 0)
+        os.close(write_fd)
+        self.assertEqual(os.read(read_fd, 64), b'child reset')
+        self.assertIs(metrics_factory._HTTP, http)
+        os.close(read_fd)
+
+    @patch.object(MetricWorker, '_start')
+    def test_worker_drop_metrics_when_queue_is_full(
+            self,
+            _start_mock: MagicMock) -> None:
+        worker = MetricWorker(MagicMock(), maxsize=1)
+
+        worker.put('gitlab_crawl', 'dev')
+        worker.put('gitlab_crawl', 'dev')
+
+        self.assertEqual(worker.dropped, 1)
 